@@ -0,0 +1,34 @@
+"""
+Shared label-font loader for the generate_qr_* scripts
+Each font is parsed once per process, so pool workers load it only once
+"""
+
+import functools
+import os
+
+from PIL import ImageFont
+
+# Bold faces tried in order; the first one installed wins
+BOLD_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+)
+REGULAR_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+@functools.lru_cache(maxsize=None)
+def load_font(paths, size):
+    """Load the first installed font in paths at size, or PIL's default font"""
+    for fp in paths:
+        if os.path.exists(fp):
+            try:
+                return ImageFont.truetype(fp, size)
+            except OSError:
+                break
+    return ImageFont.load_default()
+
+def get_fonts(large_size, small_size, large_paths=BOLD_FONT_PATHS, small_paths=BOLD_FONT_PATHS):
+    """Return the cached (font_large, font_small) pair for a label layout"""
+    return load_font(large_paths, large_size), load_font(small_paths, small_size)
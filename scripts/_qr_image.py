@@ -0,0 +1,63 @@
+"""
+Shared QR rendering helpers for the generate_qr_* scripts
+Paints the module matrix with NumPy instead of one PIL rectangle per module
+"""
+
+import io
+import time
+import zipfile
+
+import numpy as np
+import qrcode
+from PIL import Image, ImageDraw
+
+def pinned_encoder(error_correction):
+    """QR encoder pinned to version 2 at the given error correction level"""
+    # PALITANA_YATRA_{badge} tokens are at most 18 bytes, which always
+    # fits version 2, so callers can make(fit=False) and skip the version search
+    return qrcode.QRCode(
+        version=2,
+        error_correction=error_correction,
+        box_size=10,
+        border=4,
+    )
+
+def qr_image(qr):
+    """Render a made QRCode as a 1-bit image with black modules on white"""
+    # get_matrix() already includes the quiet-zone border
+    modules = np.array(qr.get_matrix(), dtype=bool)
+    pixels = np.kron(modules, np.ones((qr.box_size, qr.box_size), dtype=bool))
+    return Image.fromarray(~pixels)
+
+# Card canvas reused for every card this process renders
+_canvas = None
+_canvas_draw = None
+
+def blank_canvas(size):
+    """Return this worker's card canvas and its drawer, cleared to white"""
+    global _canvas, _canvas_draw
+    if _canvas is None or _canvas.size != size:
+        _canvas = Image.new('L', size, 'white')
+        _canvas_draw = ImageDraw.Draw(_canvas)
+    else:
+        _canvas.paste(255, (0, 0) + size)
+    return _canvas, _canvas_draw
+
+def save_png(img, filepath, **params):
+    """Encode an image as PNG once, write it to filepath and return the bytes"""
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', **params)
+    png = buf.getvalue()
+    with open(filepath, 'wb') as f:
+        f.write(png)
+    return png
+
+def write_png_zip(zip_path, files):
+    """Write (filename, PNG bytes) pairs to a zip in the given order"""
+    # PNGs are already deflated, so store them as-is under one shared timestamp
+    date_time = time.localtime()[:6]
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+        for filename, png in files:
+            zinfo = zipfile.ZipInfo(filename, date_time=date_time)
+            zinfo.external_attr = 0o100644 << 16
+            zipf.writestr(zinfo, png)
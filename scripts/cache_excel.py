@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Cache the participant sheet of IDCardData_Final.xlsx as Parquet
+yatra_data.load_excel() refreshes a stale cache on its own; run this to rebuild it up front
+"""
+
+import os
+
+from yatra_data import EXCEL_FILE, PARQUET_FILE, cache_excel
+
+df = cache_excel()
+
+if os.path.exists(PARQUET_FILE):
+    print(f"✅ Cached {len(df)} rows from {EXCEL_FILE}")
+    print(f"Saved to: {PARQUET_FILE}")
+else:
+    print(f"⚠️  Could not cache {EXCEL_FILE} as Parquet (mixed cell types); scripts will read the workbook directly")
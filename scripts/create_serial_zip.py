@@ -4,19 +4,23 @@ Create zip file with QR codes added in strict badge number serial order
 """
 
 import os
+import shutil
+import time
 import zipfile
+from tqdm import tqdm
 
 # Source directory
 source_dir = '/home/ubuntu/palitana-yatra-app/qr_codes_serial'
 
 # Get all files
-all_files = [f for f in os.listdir(source_dir) if f.endswith('.png')]
+entries = [e for e in os.scandir(source_dir) if e.name.endswith('.png')]
 
 # Sort by badge number (extract number from filename)
-def get_badge_num(filename):
-    return int(filename.split('_')[0])
+def get_badge_num(entry):
+    return int(entry.name.split('_', 1)[0])
 
-files_sorted = sorted(all_files, key=get_badge_num)
+entries_sorted = sorted(entries, key=get_badge_num)
+files_sorted = [e.name for e in entries_sorted]
 
 print(f"Total files: {len(files_sorted)}")
 print(f"First 10 files in order:")
@@ -33,12 +37,16 @@ zip_path = '/home/ubuntu/palitana-yatra-app/palitana_qr_codes_serial_order.zip'
 print(f"\nCreating zip file: {zip_path}")
 print("Adding files in strict serial order...")
 
-with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-    for idx, filename in enumerate(files_sorted):
-        filepath = os.path.join(source_dir, filename)
-        zipf.write(filepath, filename)
-        if (idx + 1) % 100 == 0:
-            print(f"  Added {idx + 1}/{len(files_sorted)} files...")
+# PNGs are already deflated, so store them as-is; every entry gets the
+# same timestamp so no per-file stat is needed
+date_time = time.localtime()[:6]
+with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+    for entry in tqdm(entries_sorted, desc="Adding files"):
+        zinfo = zipfile.ZipInfo(entry.name, date_time=date_time)
+        zinfo.compress_type = zipfile.ZIP_STORED
+        zinfo.external_attr = 0o100644 << 16
+        with open(entry.path, 'rb') as src, zipf.open(zinfo, 'w', force_zip64=False) as dst:
+            shutil.copyfileobj(src, dst)
 
 print(f"\n✅ Created zip file with {len(files_sorted)} files in serial order")
 
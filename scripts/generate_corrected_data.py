@@ -4,54 +4,63 @@ Generate corrected participant data from IDCardData_1.xlsx
 This is the source of truth - 413 participants
 """
 
-import pandas as pd
-import json
+import hashlib
+import orjson
 import uuid
 
-# Read the Excel file
-excel_file = '/home/ubuntu/palitana-yatra-app/IDCardData_Final.xlsx'
-df = pd.read_excel(excel_file, sheet_name='Sheet8')
-df.columns = df.columns.str.strip()
+from yatra_data import load_excel
+
+# uuid5 is SHA-1 over NAMESPACE_DNS + name, and every name starts with
+# "palitana-yatra-", so hash that prefix once and copy the state per badge
+_UUID_PREFIX_SHA1 = hashlib.sha1(uuid.NAMESPACE_DNS.bytes + b"palitana-yatra-")
+
+def participant_uuid(badge):
+    """Same value as uuid.uuid5(uuid.NAMESPACE_DNS, f"palitana-yatra-{badge}")"""
+    h = _UUID_PREFIX_SHA1.copy()
+    h.update(str(badge).encode())
+    return str(uuid.UUID(bytes=h.digest()[:16], version=5))
+
+# Read the Excel data (cached; see yatra_data.load_excel)
+df = load_excel()
 
 print(f"Reading {len(df)} participants from Excel...")
 
-participants = []
-
-for idx, row in df.iterrows():
-    badge = int(row['Badge Number'])
-    name = str(row['Name']).strip() if pd.notna(row['Name']) else ''
-    age = int(row['Age']) if pd.notna(row['Age']) else None
-    blood_group = str(row['Blood Group']).strip() if pd.notna(row['Blood Group']) else None
-    emergency_contact = str(int(row['Emergency Contact Number'])) if pd.notna(row['Emergency Contact Number']) else ''
-    photo_uri = str(row['Drive Photo Link']).strip() if pd.notna(row['Drive Photo Link']) else None
-    
-    # Generate consistent UUID based on badge number for reproducibility
-    participant_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"palitana-yatra-{badge}"))
-    
-    # Generate QR token
-    qr_token = f"PALITANA_YATRA_{badge}"
-    
-    participant = {
-        "uuid": participant_uuid,
+# Type each column once so building the records needs no per-cell conversion
+df['Badge Number'] = df['Badge Number'].astype('int64')
+df['Name'] = df['Name'].astype('string').str.strip()
+df['Age'] = df['Age'].astype('Int64')  # nullable
+df['Blood Group'] = df['Blood Group'].astype('string').str.strip()
+df['Emergency Contact Number'] = df['Emergency Contact Number'].astype('Int64').astype('string')
+df['Drive Photo Link'] = df['Drive Photo Link'].astype('string').str.strip()
+
+# Missing name/contact become '', every other gap None, all as plain Python values
+columns = ['Badge Number', 'Name', 'Age', 'Blood Group', 'Emergency Contact Number', 'Drive Photo Link']
+rows = df[columns].fillna({'Name': '', 'Emergency Contact Number': ''}).astype(object)
+rows = rows.where(rows.notna(), None)
+
+participants = [
+    {
+        # Consistent UUID based on badge number for reproducibility
+        "uuid": participant_uuid(badge),
         "name": name,
         "mobile": emergency_contact,  # Using emergency contact as mobile
-        "qrToken": qr_token,
+        "qrToken": f"PALITANA_YATRA_{badge}",
         "emergencyContact": emergency_contact,
         "photoUri": photo_uri,
         "bloodGroup": blood_group,
         "age": age,
         "badgeNumber": badge
     }
-    
-    participants.append(participant)
+    for badge, name, age, blood_group, emergency_contact, photo_uri in rows.itertuples(index=False, name=None)
+]
 
 # Sort by badge number
 participants.sort(key=lambda x: x['badgeNumber'])
 
 # Save to JSON
 output_file = '/home/ubuntu/palitana-yatra-app/participants_corrected.json'
-with open(output_file, 'w') as f:
-    json.dump(participants, f, indent=2)
+with open(output_file, 'wb') as f:
+    f.write(orjson.dumps(participants, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
 print(f"\n✅ Generated {len(participants)} participants")
 print(f"Saved to: {output_file}")
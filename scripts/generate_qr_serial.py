@@ -3,10 +3,11 @@
 Generate QR codes for all participants with filenames in serial order: 001_name.png, 002_name.png, etc.
 """
 
-import json
+import orjson
 import os
 import re
-import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
 
 try:
     import qrcode
@@ -14,35 +15,31 @@ except ImportError:
     os.system("pip3 install qrcode[pil]")
     import qrcode
 
-# Load participant data
-with open('/home/ubuntu/palitana-yatra-app/participants_corrected.json', 'r') as f:
-    participants = json.load(f)
+from _qr_image import pinned_encoder, qr_image, save_png, write_png_zip
 
-# Sort by badge number
-participants_sorted = sorted(participants, key=lambda x: x['badgeNumber'])
-
-# Create output directory
+# Output directory
 output_dir = '/home/ubuntu/palitana-yatra-app/qr_codes_serial'
-os.makedirs(output_dir, exist_ok=True)
-
-# Clear existing files
-for f in os.listdir(output_dir):
-    os.remove(os.path.join(output_dir, f))
 
-print(f"Generating QR codes for {len(participants_sorted)} participants in serial order...")
+# Filename patterns, compiled once at import
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\-]')
+_UNDERSCORE_RUNS_RE = re.compile(r'_+')
 
 def sanitize_filename(name):
     """Remove or replace characters that are invalid in filenames"""
-    # Replace spaces with underscores
-    name = name.replace(' ', '_')
-    # Remove special characters except underscores and hyphens
-    name = re.sub(r'[^\w\-]', '', name)
-    # Remove multiple underscores
-    name = re.sub(r'_+', '_', name)
-    return name
-
-generated_count = 0
-for p in participants_sorted:
+    # Replace spaces with underscores, remove special characters except
+    # underscores and hyphens, then collapse multiple underscores
+    return _UNDERSCORE_RUNS_RE.sub('_', _UNSAFE_CHARS_RE.sub('', name.replace(' ', '_')))
+
+# QR encoder reused for every participant a worker renders
+qr_proto = None
+
+def init_worker():
+    """Build this worker's QR encoder"""
+    global qr_proto
+    qr_proto = pinned_encoder(qrcode.constants.ERROR_CORRECT_M)
+
+def render_one(p):
+    """Render and save the QR code for one participant, returning its PNG bytes"""
     badge_number = p['badgeNumber']
     name = p['name']
     qr_token = p['qrToken']
@@ -54,48 +51,58 @@ for p in participants_sorted:
     filename = f"{badge_number:03d}_{safe_name}.png"
     filepath = os.path.join(output_dir, filename)
     
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_token)
-    qr.make(fit=True)
+    # Generate QR code, reusing this worker's encoder
+    qr_proto.clear()
+    qr_proto.add_data(qr_token)
+    qr_proto.make(fit=False)
     
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(filepath)
-    
-    generated_count += 1
-    if generated_count % 50 == 0:
-        print(f"Generated {generated_count}/{len(participants_sorted)} QR codes...")
-
-print(f"✅ Generated all {generated_count} QR codes in serial order")
-
-# Create zip file
-zip_path = '/home/ubuntu/palitana-yatra-app/palitana_qr_codes_serial.zip'
-print(f"Creating zip file: {zip_path}")
-
-with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-    for filename in sorted(os.listdir(output_dir)):
-        if filename.endswith('.png'):
-            filepath = os.path.join(output_dir, filename)
-            zipf.write(filepath, filename)
-
-# Get zip file size
-zip_size = os.path.getsize(zip_path) / (1024 * 1024)
-print(f"✅ Created zip file: {zip_path} ({zip_size:.2f} MB)")
-
-# List first 15 files to show serial order
-print("\nFiles in serial order:")
-files = sorted(os.listdir(output_dir))[:15]
-for f in files:
-    print(f"  {f}")
-print(f"  ...")
-# Show last 5
-files_last = sorted(os.listdir(output_dir))[-5:]
-for f in files_last:
-    print(f"  {f}")
-
-print(f"\nTotal: {len(os.listdir(output_dir))} QR codes")
+    img = qr_image(qr_proto)
+    # Encode once; the bytes go both to disk and into the zip
+    return filename, save_png(img, filepath)
+
+if __name__ == '__main__':
+    # Load participant data
+    with open('/home/ubuntu/palitana-yatra-app/participants_corrected.json', 'rb') as f:
+        participants = orjson.loads(f.read())
+
+    # Sort by badge number
+    participants_sorted = sorted(participants, key=lambda x: x['badgeNumber'])
+
+    # Create output directory
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Clear existing files
+    for entry in os.scandir(output_dir):
+        os.remove(entry.path)
+
+    print(f"Generating QR codes for {len(participants_sorted)} participants in serial order...")
+
+    # Each PNG is independent, so render them across all cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=init_worker) as executor:
+        results = executor.map(render_one, participants_sorted, chunksize=16)
+        png_files = list(tqdm(results, total=len(participants_sorted), desc="Generating QR codes"))
+
+    print(f"✅ Generated all {len(png_files)} QR codes in serial order")
+
+    # Create zip file
+    zip_path = '/home/ubuntu/palitana-yatra-app/palitana_qr_codes_serial.zip'
+    print(f"Creating zip file: {zip_path}")
+
+    # Write the rendered PNGs straight from memory, in filename order
+    png_files.sort()
+    write_png_zip(zip_path, png_files)
+
+    # Get zip file size
+    zip_size = os.path.getsize(zip_path) / (1024 * 1024)
+    print(f"✅ Created zip file: {zip_path} ({zip_size:.2f} MB)")
+
+    # List first 15 files to show serial order
+    print("\nFiles in serial order:")
+    for filename, _ in png_files[:15]:
+        print(f"  {filename}")
+    print(f"  ...")
+    # Show last 5
+    for filename, _ in png_files[-5:]:
+        print(f"  {filename}")
+
+    print(f"\nTotal: {len(png_files)} QR codes")
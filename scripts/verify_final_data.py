@@ -4,28 +4,45 @@ Verify final participant data from IDCardData_1.xlsx
 Extract all sheets and analyze the data structure
 """
 
+import datetime
 import pandas as pd
-import json
+import orjson
 import sys
 
-# Read the Excel file
-excel_file = '/home/ubuntu/palitana-yatra-app/IDCardData_Final.xlsx'
+from yatra_data import load_workbook
+
+def json_cell(v):
+    """Timestamps as ISO-8601 strings and durations as str(); other values as-is"""
+    if isinstance(v, (datetime.date, datetime.time)):
+        return v.isoformat()
+    if isinstance(v, datetime.timedelta):
+        return str(v)
+    return v
+
+def iso_timestamps(values):
+    """Render any timestamps (and durations) in a column as strings orjson can write"""
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+        return values.map(json_cell, na_action='ignore')
+    if values.dtype == object:
+        return values.map(json_cell)
+    return values
 
 print("=" * 60)
 print("ANALYZING IDCardData_1.xlsx (Final Data)")
 print("=" * 60)
 
-# Get all sheet names
-xl = pd.ExcelFile(excel_file)
-print(f"\nSheet names: {xl.sheet_names}")
+# Parse the workbook once; every sheet below comes from this dict
+sheets = load_workbook()
+sheet_names = list(sheets)
+print(f"\nSheet names: {sheet_names}")
 
 # Read each sheet and analyze
-for sheet_name in xl.sheet_names:
+for sheet_name in sheet_names:
     print(f"\n{'='*60}")
     print(f"SHEET: {sheet_name}")
     print("=" * 60)
     
-    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    df = sheets[sheet_name]
     print(f"Rows: {len(df)}")
     print(f"Columns: {list(df.columns)}")
     
@@ -44,15 +61,15 @@ print("=" * 60)
 
 # Try to find the main data sheet
 main_sheet = None
-for sheet in xl.sheet_names:
+for sheet in sheet_names:
     if 'final' in sheet.lower() or 'data' in sheet.lower():
         main_sheet = sheet
         break
 if main_sheet is None:
-    main_sheet = xl.sheet_names[0]
+    main_sheet = sheet_names[0]
 
 print(f"\nUsing sheet: {main_sheet}")
-df = pd.read_excel(excel_file, sheet_name=main_sheet)
+df = sheets[main_sheet]
 
 # Clean column names
 df.columns = df.columns.str.strip()
@@ -64,20 +81,13 @@ for col in df.columns:
     non_null = df[col].notna().sum()
     print(f"  {col}: {non_null}/{len(df)}")
 
-# Export to JSON for comparison
-output_data = []
-for idx, row in df.iterrows():
-    participant = {}
-    for col in df.columns:
-        val = row[col]
-        if pd.notna(val):
-            participant[col] = val
-        else:
-            participant[col] = None
-    output_data.append(participant)
+# Export to JSON for comparison, with timestamps as ISO strings and gaps as None
+export = df.apply(iso_timestamps)
+export = export.astype(object).where(export.notna(), None)
+output_data = export.to_dict('records')
 
 # Save to JSON
-with open('/home/ubuntu/palitana-yatra-app/final_data_extracted.json', 'w') as f:
-    json.dump(output_data, f, indent=2, default=str)
+with open('/home/ubuntu/palitana-yatra-app/final_data_extracted.json', 'wb') as f:
+    f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
 print(f"\nExtracted {len(output_data)} participants to final_data_extracted.json")
@@ -0,0 +1,293 @@
+"""
+Shared loading and comparison helpers for the participant data scripts
+Loads are cached, so one Python session running several checks parses the workbook once
+"""
+
+import functools
+import os
+
+import orjson
+import pandas as pd
+
+APP_DIR = '/home/ubuntu/palitana-yatra-app'
+EXCEL_FILE = os.path.join(APP_DIR, 'IDCardData_Final.xlsx')
+PARQUET_FILE = os.path.join(APP_DIR, 'IDCardData_Final.parquet')
+SHEET_NAME = 'Sheet8'
+
+# Whitespace ignored when comparing text (space, tab, non-breaking space)
+_STRIP_WS = str.maketrans('', '', ' \t\u00A0')
+
+def column_values(df, col, convert, missing=None):
+    """Convert a whole column in one pass, mapping empty cells to `missing`"""
+    values = df[col]
+    return convert(values).astype(object).where(values.notna(), missing).tolist()
+
+def normalize(values):
+    """Case-insensitive form of a text column with whitespace removed"""
+    return values.str.translate(_STRIP_WS).str.casefold()
+
+def differs(a, b):
+    """Element-wise inequality that treats two empty cells as equal"""
+    return a.ne(b).fillna(True) & ~(a.isna() & b.isna())
+
+def read_sheet():
+    """Parse the participant sheet from the workbook, with column names stripped"""
+    df = pd.read_excel(EXCEL_FILE, sheet_name=SHEET_NAME, engine='openpyxl')
+    df.columns = df.columns.str.strip()
+    return df
+
+def cache_excel():
+    """Re-parse the participant sheet into the Parquet cache and return it"""
+    df = read_sheet()
+    try:
+        df.to_parquet(PARQUET_FILE, index=False)
+    except (TypeError, ValueError):
+        # Arrow rejects columns mixing cell types (e.g. a number in Name);
+        # serve the parsed sheet uncached and drop any stale or partial cache
+        if os.path.exists(PARQUET_FILE):
+            os.remove(PARQUET_FILE)
+    return df
+
+@functools.lru_cache(maxsize=1)
+def _cached_sheet():
+    # Fall back to the workbook when the cache is missing or older than it
+    if os.path.exists(PARQUET_FILE) and os.path.getmtime(PARQUET_FILE) >= os.path.getmtime(EXCEL_FILE):
+        return pd.read_parquet(PARQUET_FILE)
+    return cache_excel()
+
+def load_excel():
+    """Participant sheet as a DataFrame, loaded at most once per session"""
+    # Hand out copies so no caller can modify the cached frame
+    return _cached_sheet().copy()
+
+@functools.lru_cache(maxsize=1)
+def _cached_workbook():
+    return pd.read_excel(EXCEL_FILE, sheet_name=None, engine='openpyxl')
+
+def load_workbook():
+    """Every sheet of the workbook as {sheet name: DataFrame}, parsed once per session"""
+    return {name: df.copy() for name, df in _cached_workbook().items()}
+
+@functools.lru_cache(maxsize=None)
+def _cached_db_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def load_db_json(path):
+    """Participant records from a database export, read once per path"""
+    # Decode on every call so each caller gets its own records, like load_excel()
+    return orjson.loads(_cached_db_bytes(path))
+
+def latest_per_badge(df_db):
+    """Keep the last record for each badge, as a dict keyed by badge number would"""
+    return df_db.drop_duplicates('badgeNumber', keep='last')
+
+def compare(df_excel, df_db):
+    """
+    Compare Excel rows with database records, ignoring case and whitespace in text
+    Returns the report written to verification_report.json
+    """
+    # Join Excel rows against database records by badge number in one pass.
+    # An outer merge sorts by badge, so restore Excel row order, then DB order
+    # (where each badge first appears) for records only in the database
+    db_records = latest_per_badge(df_db.assign(_db_pos=df_db.groupby('badgeNumber', sort=False).ngroup()))
+    merged = df_excel.assign(_excel_pos=range(len(df_excel))).merge(
+        db_records, left_on='Badge Number', right_on='badgeNumber',
+        how='outer', indicator=True)
+    merged = merged.sort_values(['_excel_pos', '_db_pos'], na_position='last', kind='stable', ignore_index=True)
+    in_both = merged['_merge'] == 'both'
+    merged['badge'] = merged['Badge Number'].fillna(merged['badgeNumber']).astype(int)
+
+    # Normalize both sides column-wise; a field only counts when it is non-empty
+    excel_name = merged['Name'].astype(str).str.strip()
+    db_name = merged['name'].fillna('').astype(str).str.strip()
+    has_excel_name = merged['Name'].notna() & excel_name.ne('')
+    has_db_name = db_name.ne('')
+
+    excel_age = merged['Age'].astype('Int64')
+    db_age = merged['age'].astype('Int64')
+    has_excel_age = excel_age.fillna(0).ne(0)
+    has_db_age = db_age.fillna(0).ne(0)
+
+    excel_blood = merged['Blood Group'].astype(str).str.strip()
+    db_blood = merged['bloodGroup'].fillna('').astype(str).str.strip()
+    has_excel_blood = merged['Blood Group'].notna() & excel_blood.ne('')
+    has_db_blood = db_blood.ne('')
+
+    excel_emergency = merged['Emergency Contact Number'].astype('Int64').astype(str)
+    # A null DB contact reads as 'None', as str() of the record value did, so it
+    # is still reported against an Excel number
+    db_emergency = merged['emergencyContact'].fillna('None').astype(str).str.strip()
+    has_excel_emergency = merged['Emergency Contact Number'].notna()
+    has_db_emergency = db_emergency.ne('')
+
+    # Compare name (case-insensitive, ignore extra spaces)
+    name_mismatch = in_both & has_excel_name & has_db_name & normalize(excel_name).ne(normalize(db_name))
+    # Compare age
+    age_mismatch = in_both & has_excel_age & has_db_age & excel_age.ne(db_age).fillna(False)
+    age_missing = in_both & has_excel_age & ~has_db_age
+    # Compare blood group
+    blood_mismatch = in_both & has_excel_blood & has_db_blood & normalize(excel_blood).ne(normalize(db_blood))
+    blood_missing = in_both & has_excel_blood & ~has_db_blood
+    # Compare emergency contact
+    emergency_mismatch = in_both & has_excel_emergency & has_db_emergency & excel_emergency.ne(db_emergency)
+
+    has_issue = name_mismatch | age_mismatch | age_missing | blood_mismatch | blood_missing | emergency_mismatch
+    matches = int((in_both & ~has_issue).sum())
+
+    # Only the flagged rows need Python-level formatting
+    flagged = pd.DataFrame({
+        'badge': merged['badge'],
+        'name': excel_name.astype(object).where(merged['Name'].notna(), None),
+        'db_name': db_name,
+        'excel_age': excel_age,
+        'db_age': db_age,
+        'excel_blood': excel_blood,
+        'db_blood': db_blood,
+        'excel_emergency': excel_emergency,
+        'db_emergency': db_emergency,
+        'name_mismatch': name_mismatch,
+        'age_mismatch': age_mismatch,
+        'age_missing': age_missing,
+        'blood_mismatch': blood_mismatch,
+        'blood_missing': blood_missing,
+        'emergency_mismatch': emergency_mismatch,
+    })[has_issue]
+
+    discrepancies = []
+    for r in flagged.itertuples(index=False):
+        issues = []
+        if r.name_mismatch:
+            issues.append(f"Name: Excel='{r.name}' vs DB='{r.db_name}'")
+        if r.age_mismatch:
+            issues.append(f"Age: Excel={r.excel_age} vs DB={r.db_age}")
+        if r.age_missing:
+            issues.append(f"Age: Excel={r.excel_age} vs DB=None")
+        if r.blood_mismatch:
+            issues.append(f"Blood: Excel='{r.excel_blood}' vs DB='{r.db_blood}'")
+        if r.blood_missing:
+            issues.append(f"Blood: Excel='{r.excel_blood}' vs DB=None")
+        if r.emergency_mismatch:
+            issues.append(f"Emergency: Excel='{r.excel_emergency}' vs DB='{r.db_emergency}'")
+        discrepancies.append({
+            'badge': r.badge,
+            'name': r.name,
+            'issues': issues
+        })
+
+    # Records in Excel but not in DB
+    only_excel = merged[merged['_merge'] == 'left_only']
+    missing_in_db = [
+        {
+            'badge': badge,
+            'name': name,
+            'age': age,
+            'blood_group': blood,
+            'emergency_contact': emergency,
+            'photo': photo
+        }
+        for badge, name, age, blood, emergency, photo in zip(
+            only_excel['badge'].tolist(),
+            column_values(only_excel, 'Name', lambda s: s.astype(str).str.strip()),
+            column_values(only_excel, 'Age', lambda s: s.astype('Int64')),
+            column_values(only_excel, 'Blood Group', lambda s: s.astype(str).str.strip()),
+            column_values(only_excel, 'Emergency Contact Number', lambda s: s.astype('Int64').astype(str)),
+            column_values(only_excel, 'Drive Photo Link', lambda s: s.astype(str).str.strip()))
+    ]
+
+    # Records in DB but not in Excel
+    only_db = merged[merged['_merge'] == 'right_only']
+    missing_in_excel = [
+        {
+            'badge': badge,
+            'name': name
+        }
+        for badge, name in zip(only_db['badge'].tolist(), column_values(only_db, 'name', lambda s: s))
+    ]
+
+    return {
+        'summary': {
+            'excel_count': len(df_excel),
+            'database_count': len(df_db),
+            'matching': matches,
+            'discrepancies': len(discrepancies),
+            'missing_in_db': len(missing_in_db),
+            'missing_in_excel': len(missing_in_excel)
+        },
+        'discrepancies': discrepancies,
+        'missing_in_db': missing_in_db,
+        'missing_in_excel': missing_in_excel
+    }
+
+def verify_exact(df_excel, df_db):
+    """
+    Check that every Excel row has an identical database record
+    Returns (matching record count, list of discrepancy messages)
+    """
+    # Join Excel rows against database records by badge number in one pass
+    merged = df_excel.merge(latest_per_badge(df_db), left_on='Badge Number', right_on='badgeNumber',
+                            how='left', indicator=True)
+    missing = merged['_merge'] == 'left_only'
+
+    excel_name = merged['Name'].astype(str).str.strip().where(merged['Name'].notna())
+    excel_age = merged['Age'].astype('Int64')
+    excel_blood = merged['Blood Group'].astype(str).str.strip().where(merged['Blood Group'].notna())
+    excel_emergency = merged['Emergency Contact Number'].astype('Int64').astype(str).where(
+        merged['Emergency Contact Number'].notna())
+
+    # Compare each field column-wise
+    name_mismatch = ~missing & differs(excel_name, merged['name'])
+    age_mismatch = ~missing & differs(excel_age, merged['age'].astype('Int64'))
+    blood_mismatch = ~missing & differs(excel_blood, merged['bloodGroup'])
+    emergency_mismatch = ~missing & differs(excel_emergency, merged['emergencyContact'])
+
+    has_issue = name_mismatch | age_mismatch | blood_mismatch | emergency_mismatch
+    matches = int((~missing & ~has_issue).sum())
+
+    # Only the flagged rows need Python-level formatting
+    is_flagged = missing | has_issue
+    rows = merged[is_flagged]
+    flagged = pd.DataFrame({
+        'badge': rows['Badge Number'].astype(int).tolist(),
+        'missing': missing[is_flagged].tolist(),
+        'excel_name': column_values(rows, 'Name', lambda s: s.astype(str).str.strip()),
+        'db_name': column_values(rows, 'name', lambda s: s),
+        'excel_age': column_values(rows, 'Age', lambda s: s.astype('Int64')),
+        'db_age': column_values(rows, 'age', lambda s: s.astype('Int64')),
+        'excel_blood': column_values(rows, 'Blood Group', lambda s: s.astype(str).str.strip()),
+        'db_blood': column_values(rows, 'bloodGroup', lambda s: s),
+        'excel_emergency': column_values(rows, 'Emergency Contact Number', lambda s: s.astype('Int64').astype(str)),
+        'db_emergency': column_values(rows, 'emergencyContact', lambda s: s),
+        'name_mismatch': name_mismatch[is_flagged].tolist(),
+        'age_mismatch': age_mismatch[is_flagged].tolist(),
+        'blood_mismatch': blood_mismatch[is_flagged].tolist(),
+        'emergency_mismatch': emergency_mismatch[is_flagged].tolist(),
+    }, dtype=object)
+
+    discrepancies = []
+    for r in flagged.itertuples(index=False):
+        if r.missing:
+            discrepancies.append(f"Badge #{r.badge} missing in database")
+            continue
+        
+        issues = []
+        
+        # Compare name
+        if r.name_mismatch:
+            issues.append(f"Name: '{r.excel_name}' vs '{r.db_name}'")
+        
+        # Compare age
+        if r.age_mismatch:
+            issues.append(f"Age: {r.excel_age} vs {r.db_age}")
+        
+        # Compare blood group
+        if r.blood_mismatch:
+            issues.append(f"Blood: '{r.excel_blood}' vs '{r.db_blood}'")
+        
+        # Compare emergency contact
+        if r.emergency_mismatch:
+            issues.append(f"Emergency: '{r.excel_emergency}' vs '{r.db_emergency}'")
+        
+        discrepancies.append(f"Badge #{r.badge}: " + ", ".join(issues))
+
+    return matches, discrepancies